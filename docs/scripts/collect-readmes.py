@@ -15,9 +15,20 @@ import re
 import json
 import subprocess
 import shutil
+from functools import cache
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
+# 匹配第一个一级标题行（# 标题）
+_TITLE_RE = re.compile(r'^[ \t]*# [ \t]*(\S.*?)[ \t\r]*$', re.MULTILINE)
+
+# 扫描时跳过的目录（以 . 开头的目录也会被跳过）
+SKIP_DIRS = frozenset({'node_modules', 'dist', 'build'})
+
+
+@cache
 def get_project_root() -> Path:
     """获取 git 仓库根目录"""
     try:
@@ -33,36 +44,74 @@ def get_project_root() -> Path:
         return Path(__file__).parent.parent.parent
 
 
+def find_readmes(root: Path) -> Iterator[Path]:
+    """递归查找 README.md，跳过的目录在进入之前就被剪枝"""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name.startswith('.') or entry.name in SKIP_DIRS:
+                    continue
+                yield from find_readmes(Path(entry.path))
+            elif entry.name == 'README.md' and entry.is_file():
+                yield Path(entry.path)
+
+
+def list_readmes(project_root: Path, target_dir: str) -> list[Path]:
+    """列出目标目录下的 README.md，优先读取 git 索引，失败时回退到目录扫描"""
+    try:
+        result = subprocess.run(
+            ['git', '-C', str(project_root), 'ls-files', '-z', '--cached', '--others', '--exclude-standard',
+             '--', f':(glob){target_dir}/**/README.md'],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return list(find_readmes(project_root / target_dir))
+
+    readmes = []
+    for rel in result.stdout.split('\0'):
+        if not rel:
+            continue
+        parts = Path(rel).parts[1:-1]
+        # 跳过 node_modules、.venv 等目录，以及已从工作区删除的文件
+        if any(part.startswith('.') or part in SKIP_DIRS for part in parts):
+            continue
+        readme_path = project_root / rel
+        if readme_path.is_file():
+            readmes.append(readme_path)
+    return readmes
+
+
 def extract_title(content: str) -> str:
     """从 Markdown 内容中提取第一个 # 标题"""
-    lines = content.split('\n')
-    for line in lines:
-        line = line.strip()
-        if line.startswith('# '):
-            return line[2:].strip()
-    return "Untitled"
+    match = _TITLE_RE.search(content)
+    return match.group(1) if match else "Untitled"
 
 
-def process_readme(readme_path: Path, project_root: Path, output_dir: Path):
-    """处理单个 README.md 文件"""
-    # 读取内容
+def process_readme(readme_path: Path, project_root: Path, output_dir: Path, target_dir: str) -> tuple[dict | None, str]:
+    """处理单个 README.md 文件，返回 (收集到的元数据, 日志行)；跳过时元数据为 None"""
+    # 读取内容（每个文件只读取一次）
     content = readme_path.read_text(encoding='utf-8')
-
-    # 提取标题
-    title = extract_title(content)
+    stripped = content.strip()
 
     # 计算相对路径
     rel_path = readme_path.parent.relative_to(project_root)
 
+    # 验证：跳过空文件或没有有效标题的文件
+    if not stripped:
+        return None, f"⊘ {rel_path} -> 跳过（文件为空）"
+
+    title = extract_title(content)
+    if title == "Untitled":
+        return None, f"⊘ {rel_path} -> 跳过（没有找到标题）"
+
     # 生成输出文件名：apps/100-simple-chat-invoke -> apps~100-simple-chat-invoke.md
     output_name = str(rel_path).replace('/', '~') + '.md'
     output_path = output_dir / output_name
 
-    # 检查内容是否已有 frontmatter
-    has_frontmatter = content.strip().startswith('---')
-
     # 构建输出内容
-    if not has_frontmatter:
+    if not stripped.startswith('---'):
         # 如果没有 frontmatter，添加一个
         frontmatter = f"""---
 title: {title}
@@ -74,11 +123,17 @@ title: {title}
         # 如果已有 frontmatter，保持原样
         output_content = content
 
-    # 写入输出文件
-    output_path.write_text(output_content, encoding='utf-8')
+    # 写入输出文件（一次性编码为字节后写入，跳过文本模式的编码层）
+    output_path.write_bytes(output_content.encode('utf-8'))
 
-    print(f"✓ {rel_path} -> {output_name}")
-    return output_name
+    # 收集元数据
+    item = {
+        'type': target_dir,  # 'apps' or 'libs'
+        'filename': output_name,
+        'title': title,
+        'link': f'/readme/{output_name.replace(".md", "")}'
+    }
+    return item, f"✓ {rel_path} -> {output_name}"
 
 
 def generate_sidebar_json(collected_items: list[dict], output_dir: Path):
@@ -132,9 +187,9 @@ def main():
     # 重新创建输出目录
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # 扫描目标目录
+    # 扫描目标目录，先收集候选文件
     target_dirs = ['apps', 'libs']
-    collected_items = []
+    candidates = []
 
     print("🔍 扫描 README.md 文件...\n")
 
@@ -144,60 +199,26 @@ def main():
             print(f"⚠️  目录不存在: {target_dir}")
             continue
 
-        # 查找所有 README.md 文件
-        for readme_path in target_path.rglob('README.md'):
-            # 跳过 node_modules、.venv 等目录
-            if any(part.startswith('.') or part in ['node_modules', 'dist', 'build']
-                   for part in readme_path.parts):
-                continue
-
-            try:
-                # 读取内容并提取标题
-                content = readme_path.read_text(encoding='utf-8')
-                title = extract_title(content)
-
-                # 验证：跳过空文件或没有有效标题的文件
-                if not content.strip():
-                    rel_path = readme_path.parent.relative_to(project_root)
-                    print(f"⊘ {rel_path} -> 跳过（文件为空）")
-                    continue
-
-                if title == "Untitled":
-                    rel_path = readme_path.parent.relative_to(project_root)
-                    print(f"⊘ {rel_path} -> 跳过（没有找到标题）")
-                    continue
-
-                # 计算相对路径和输出文件名
-                rel_path = readme_path.parent.relative_to(project_root)
-                output_name = str(rel_path).replace('/', '~') + '.md'
-                output_path = output_dir / output_name
+        # 查找所有 README.md 文件（跳过 node_modules、.venv 等目录）
+        for readme_path in list_readmes(project_root, target_dir):
+            candidates.append((readme_path, target_dir))
 
-                # 构建输出内容
-                has_frontmatter = content.strip().startswith('---')
-                if not has_frontmatter:
-                    frontmatter = f"""---
-title: {title}
----
+    def process_one(candidate: tuple[Path, str]) -> tuple[dict | None, str]:
+        readme_path, target_dir = candidate
+        try:
+            return process_readme(readme_path, project_root, output_dir, target_dir)
+        except Exception as e:
+            return None, f"✗ 处理失败 {readme_path}: {e}"
 
-"""
-                    output_content = frontmatter + content
-                else:
-                    output_content = content
-
-                # 写入输出文件
-                output_path.write_text(output_content, encoding='utf-8')
-
-                # 收集元数据
-                collected_items.append({
-                    'type': target_dir,  # 'apps' or 'libs'
-                    'filename': output_name,
-                    'title': title,
-                    'link': f'/readme/{output_name.replace(".md", "")}'
-                })
-
-                print(f"✓ {rel_path} -> {output_name}")
-            except Exception as e:
-                print(f"✗ 处理失败 {readme_path}: {e}")
+    # 并行处理（纯文件读写，线程在 I/O 时会释放 GIL）
+    # 日志在主线程按扫描顺序输出，避免多线程输出交错
+    collected_items = []
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for item, log_line in executor.map(process_one, candidates):
+            print(log_line)
+            if item:
+                collected_items.append(item)
 
     print(f"\n✅ 完成！共收集 {len(collected_items)} 个 README 文件到 docs/readme/")
 
@@ -6,9 +6,94 @@ Tools are designed to be pure functions without side effects (no printing).
 Applications should handle logging/display themselves.
 """
 
-from datetime import datetime
+import ast
+import operator
+import time
+from functools import lru_cache
+
 from langchain_core.tools import tool
 
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# calculator 允许出现的 AST 节点（仅数字字面量与算术运算）
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Constant,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.Mod,
+    ast.Pow,
+    ast.FloorDiv,
+    ast.USub,
+    ast.UAdd,
+)
+
+# 运算结果规模上限，避免 9**9**9 之类的表达式耗尽 CPU 和内存
+_MAX_EXPONENT = 1000  # 幂运算指数的最大绝对值
+_MAX_INT_BITS = 10_000  # 整数乘法/幂运算结果的最大位数（约 3000 位十进制）
+
+_BIN_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+    ast.FloorDiv: operator.floordiv,
+}
+
+_UNARY_OPS = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+
+@lru_cache(maxsize=1024)
+def _parse_expression(expression: str) -> ast.expr:
+    """解析并校验算术表达式，按表达式字符串缓存校验后的语法树。"""
+    tree = ast.parse(expression.strip(), mode="eval")
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"不支持的表达式元素: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and (
+            isinstance(node.value, bool) or not isinstance(node.value, (int, float, complex))
+        ):
+            raise ValueError(f"不支持的常量: {node.value!r}")
+    return tree.body
+
+
+def _check_result_size(op: ast.operator, left, right) -> None:
+    """在执行幂运算和整数乘法之前估算结果规模，超出上限时抛出 ValueError。"""
+    if isinstance(op, ast.Pow):
+        if not isinstance(right, complex) and abs(right) > _MAX_EXPONENT:
+            raise ValueError(f"幂运算的指数不能超过 {_MAX_EXPONENT}")
+        if isinstance(left, int) and isinstance(right, int) and left.bit_length() * right > _MAX_INT_BITS:
+            raise ValueError(f"幂运算结果过大（超过 {_MAX_INT_BITS} 位）")
+    elif isinstance(op, ast.Mult) and isinstance(left, int) and isinstance(right, int):
+        if left.bit_length() + right.bit_length() > _MAX_INT_BITS:
+            raise ValueError(f"乘法结果过大（超过 {_MAX_INT_BITS} 位）")
+
+
+def _eval_node(node: ast.expr) -> int | float | complex:
+    """递归求值已校验的语法树。"""
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.UnaryOp):
+        return _UNARY_OPS[type(node.op)](_eval_node(node.operand))
+    left = _eval_node(node.left)
+    right = _eval_node(node.right)
+    _check_result_size(node.op, left, right)
+    return _BIN_OPS[type(node.op)](left, right)
+
+
+def _evaluate(expression: str) -> int | float | complex:
+    """计算算术表达式，只支持数字字面量与算术运算。"""
+    return _eval_node(_parse_expression(expression))
+
 
 @tool
 def get_current_time(timezone: str = "UTC") -> str:
@@ -21,13 +106,9 @@ def get_current_time(timezone: str = "UTC") -> str:
         当前时间的字符串表示
     """
     # 简单实现，实际项目中可以使用 pytz 库
-    current_time = datetime.now()
     if timezone.lower() == "utc":
-        result = f"当前 UTC 时间是: {current_time.strftime('%Y-%m-%d %H:%M:%S')}"
-    else:
-        result = f"当前时间是: {current_time.strftime('%Y-%m-%d %H:%M:%S')} (本地时间)"
-
-    return result
+        return f"当前 UTC 时间是: {time.strftime(_TIME_FORMAT, time.gmtime())}"
+    return f"当前时间是: {time.strftime(_TIME_FORMAT, time.localtime())} (本地时间)"
 
 
 @tool
@@ -41,9 +122,8 @@ def calculator(expression: str) -> str:
         计算结果
     """
     try:
-        # 使用 eval 进行计算（生产环境建议使用更安全的方法）
-        # 限制 builtins 以提高安全性
-        result = eval(expression, {"__builtins__": {}}, {})
+        # 先经过 AST 白名单校验，再逐个节点求值（不使用 eval）
+        result = _evaluate(expression)
         output = f"计算结果: {expression} = {result}"
         return output
     except Exception as e:
@@ -0,0 +1,47 @@
+"""
+calculator 表达式校验测试
+
+运行: uv run python -m unittest discover -s libs/m-tools/tests
+"""
+
+import unittest
+
+from m_tools.common import _evaluate, calculator
+
+
+class CalculatorTest(unittest.TestCase):
+    def test_arithmetic(self):
+        self.assertEqual(calculator.invoke({"expression": "10 * 5 + 3"}), "计算结果: 10 * 5 + 3 = 53")
+        self.assertEqual(calculator.invoke({"expression": "2 ** -1"}), "计算结果: 2 ** -1 = 0.5")
+        self.assertEqual(calculator.invoke({"expression": "-3 ** 2"}), "计算结果: -3 ** 2 = -9")
+        self.assertEqual(_evaluate("(1+2)**2"), 9)
+        self.assertAlmostEqual(_evaluate("(1+0.05)**10"), 1.05**10)
+        self.assertAlmostEqual(_evaluate("2**(1/2)"), 2**0.5)
+        self.assertEqual(_evaluate("9 ** 999"), 9**999)
+
+    def test_rejected_expressions(self):
+        for expression in [
+            "().__class__",  # 属性访问
+            "__import__('os')",  # 函数调用
+            "x + 1",  # 变量名
+            "True + 1",  # 布尔常量
+            "'a' * 3",  # 字符串
+            "9 ** 9 ** 9 ** 9",  # 嵌套幂
+            "2 ** 1001",  # 指数超限
+            "2 ** -1001",
+            "2 ** (500 + 501)",  # 计算后的指数超限
+            "(9 ** 999) ** 999",  # 计算后的底数导致结果过大
+            "9" * 4000 + " ** 1000",  # 超长字面量底数导致结果过大
+            "(9 ** 999) * (9 ** 999) * (9 ** 999) * (9 ** 999)",  # 连乘导致结果过大
+        ]:
+            with self.subTest(expression=expression):
+                with self.assertRaises(ValueError):
+                    _evaluate(expression)
+                self.assertTrue(calculator.invoke({"expression": expression}).startswith("计算错误"))
+
+    def test_division_by_zero(self):
+        self.assertEqual(calculator.invoke({"expression": "1 / 0"}), "计算错误: division by zero")
+
+
+if __name__ == "__main__":
+    unittest.main()
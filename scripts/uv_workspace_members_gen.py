@@ -5,23 +5,39 @@
 """
 
 from pathlib import Path
+import json
 import os
+import re
 import subprocess
 import sys
+import tomllib
 
 
 # 确保使用项目 .venv 中的 Python
 if not os.environ.get("_VENV_ACTIVATED"):
-    try:
-        git_root = subprocess.check_output(["git", "rev-parse", "--show-toplevel"], text=True).strip()
-        venv_python = f"{git_root}/.venv/bin/python"
-        if os.path.exists(venv_python) and sys.executable != venv_python:
-            os.environ["_VENV_ACTIVATED"] = "1"
-            os.execv(venv_python, [venv_python] + sys.argv)
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        pass
-
-import tomlkit
+    # 脚本位于 scripts/ 下，优先从脚本位置推断项目根目录，找不到 .venv 时再询问 git
+    venv_python = str(Path(__file__).resolve().parents[1] / ".venv" / "bin" / "python")
+    if not os.path.exists(venv_python):
+        try:
+            git_root = subprocess.check_output(["git", "rev-parse", "--show-toplevel"], text=True).strip()
+            venv_python = f"{git_root}/.venv/bin/python"
+        except (subprocess.CalledProcessError, FileNotFoundError):
+            pass
+    if os.path.exists(venv_python) and sys.executable != venv_python:
+        os.environ["_VENV_ACTIVATED"] = "1"
+        os.execv(venv_python, [venv_python] + sys.argv)
+
+# 匹配数组中的缩进行，如 '  "foo",'
+_ARRAY_INDENT_RE = re.compile(r'^(\s+)["\']', re.MULTILINE)
+
+# 匹配 [tool.uv.workspace] 段中的 members 数组（段内 members 之前不能出现其他数组或段）
+_WORKSPACE_MEMBERS_RE = re.compile(
+    r"(^\[tool\.uv\.workspace\][ \t]*\n[^\[]*?^members[ \t]*=[ \t]*)\[[^\]]*\]",
+    re.MULTILINE,
+)
+
+# tomlkit 导出数组时使用的 4 空格缩进
+_TOMLKIT_INDENT_RE = re.compile(r"^(    )", re.MULTILINE)
 
 
 def detect_toml_indent(content: str) -> int:
@@ -30,16 +46,12 @@ def detect_toml_indent(content: str) -> int:
 
     返回缩进空格数量（如 2 或 4），默认为 2。
     """
-    import re
-
-    # 查找数组中的缩进行
-    # 匹配类似 '  "foo",' 的行
-    pattern = re.compile(r'^(\s+)["\']', re.MULTILINE)
-    matches = pattern.findall(content)
+    # 查找数组中的第一个缩进行
+    match = _ARRAY_INDENT_RE.search(content)
 
-    if matches:
+    if match:
         # 返回第一个匹配的缩进长度
-        return len(matches[0])
+        return len(match.group(1))
 
     # 默认使用 2 个空格
     return 2
@@ -60,18 +72,62 @@ def find_workspace_members(project_root: Path) -> list[str]:
     ]
 
 
-def update_pyproject_toml(pyproject_path: Path, members: list[str]) -> None:
+def render_members_array(members: list[str], indent_size: int) -> str:
+    """
+    将成员列表渲染为多行 TOML 数组（与 tomlkit 的多行数组格式一致）。
+    """
+    indent = " " * indent_size
+    items = "".join(f"{indent}{json.dumps(member, ensure_ascii=False)},\n" for member in members)
+    return f"[\n{items}]"
+
+
+def members_match(content: str, members: list[str]) -> bool:
+    """
+    检查 TOML 内容能否正常解析，且 [tool.uv.workspace] members 与期望列表一致。
+    """
+    try:
+        return tomllib.loads(content)["tool"]["uv"]["workspace"]["members"] == members
+    except (tomllib.TOMLDecodeError, KeyError, TypeError):
+        return False
+
+
+def update_pyproject_toml(pyproject_path: Path, members: list[str]) -> bool:
     """
-    使用 tomlkit 更新 pyproject.toml 中的工作区成员。
+    更新 pyproject.toml 中的工作区成员。
+
+    优先只替换 [tool.uv.workspace] 中的 members 数组，其余内容原样保留；
+    找不到该数组或替换结果校验失败时回退到 tomlkit 解析（同样保留原有格式、注释和空格）。
 
-    优势：保留原有格式、注释和空格。
+    Returns:
+        bool: 是否写入了文件（内容未变化时不写入，避免更新 mtime）
     """
     content = pyproject_path.read_text(encoding="utf-8")
-    doc = tomlkit.parse(content)
 
     # 检测文件的缩进风格（空格数）
     indent_size = detect_toml_indent(content)
 
+    members_array = render_members_array(members, indent_size)
+    output, count = _WORKSPACE_MEMBERS_RE.subn(lambda m: m.group(1) + members_array, content, count=1)
+
+    # 数组内的注释或字符串可能含有 ']'，导致正则截断数组；替换结果无法还原出 members 时回退到 tomlkit
+    if not count or not members_match(output, members):
+        output = update_pyproject_toml_with_tomlkit(content, members, indent_size)
+
+    if output == content:
+        return False
+
+    pyproject_path.write_text(output, encoding="utf-8")
+    return True
+
+
+def update_pyproject_toml_with_tomlkit(content: str, members: list[str], indent_size: int) -> str:
+    """
+    使用 tomlkit 写入工作区成员，用于 [tool.uv.workspace] 段或 members 数组尚不存在的情况。
+    """
+    import tomlkit
+
+    doc = tomlkit.parse(content)
+
     # 确保 [tool.uv.workspace] 段存在
     if "tool" not in doc:
         doc["tool"] = {}
@@ -94,13 +150,9 @@ def update_pyproject_toml(pyproject_path: Path, members: list[str]) -> None:
 
     # tomlkit 默认使用 4 空格，需要替换为检测到的缩进
     if indent_size != 4:
-        # 替换数组中的缩进（4 空格 -> 检测到的缩进）
-        import re
+        output = _TOMLKIT_INDENT_RE.sub(" " * indent_size, output)
 
-        target_indent = " " * indent_size
-        output = re.sub(r"^(    )", target_indent, output, flags=re.MULTILINE)
-
-    pyproject_path.write_text(output, encoding="utf-8")
+    return output
 
 
 def update_member_project_name(member_path: Path, project_name: str) -> bool:
@@ -120,22 +172,22 @@ def update_member_project_name(member_path: Path, project_name: str) -> bool:
         return False
 
     content = pyproject_path.read_text(encoding="utf-8")
-    doc = tomlkit.parse(content)
 
-    # 检查 [project] 段是否存在
-    if "project" not in doc:
-        return False
+    # 先用 tomllib 只读检查，名称已正确时无需 tomlkit 解析和导出
+    project = tomllib.loads(content).get("project")
 
-    # 检查 name 字段是否存在
-    if "name" not in doc["project"]:
+    # 检查 [project] 段和 name 字段是否存在
+    if not isinstance(project, dict) or "name" not in project:
         return False
 
     # 如果名称已经正确，则跳过
-    current_name = doc["project"]["name"]
-    if current_name == project_name:
+    if project["name"] == project_name:
         return False
 
+    import tomlkit
+
     # 更新名称
+    doc = tomlkit.parse(content)
     doc["project"]["name"] = project_name
 
     pyproject_path.write_text(tomlkit.dumps(doc), encoding="utf-8")
@@ -161,10 +213,12 @@ def main():
         sys.exit(0)
 
     # 更新文件
-    update_pyproject_toml(pyproject_path, members)
+    if update_pyproject_toml(pyproject_path, members):
+        print("✓ Successfully updated workspace members in pyproject.toml")
+    else:
+        print("✓ Workspace members in pyproject.toml are already up to date")
 
     # 报告结果
-    print("✓ Successfully updated workspace members in pyproject.toml")
     print(f"  Found {len(members)} member(s):")
     for member in members:
         print(f"    - {member}")